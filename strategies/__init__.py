@@ -0,0 +1,75 @@
+'''
+Strategy registry
+
+Each strategy is split into:
+- a signal core: pure NumPy functions (channels, OBV, EWMA volatility, MOM ranking, SMA crossover)
+- one or more engine adapters: the zipline / backtrader / xquant glue that feeds data into the core and places orders
+
+Nothing here imports an execution framework. Adapters are only imported when an engine is
+actually requested, so sweeps and CLI tools can evaluate signals without paying framework import time.
+
+Usage:
+    from strategies import get_core, get_engine
+    sma = get_core('sma')                       # numpy only
+    handle = get_engine('sma', 'zipline')       # imports zipline here
+'''
+
+from collections import namedtuple
+import importlib
+
+StrategySpec = namedtuple('StrategySpec', ['core', 'engines'])
+
+_REGISTRY = {}
+
+
+def register(name, core, engines=None):
+    ''' Register a strategy by dotted paths, engines maps engine name -> "module" or "module:attr" '''
+    _REGISTRY[name] = StrategySpec(core, dict(engines or {}))
+
+
+def available():
+    ''' Names of the registered strategies and their engines '''
+    return {name: sorted(spec.engines) for name, spec in _REGISTRY.items()}
+
+
+def _spec(name):
+    try:
+        return _REGISTRY[name]
+    except KeyError:
+        raise KeyError('unknown strategy %r, registered: %s' % (name, ', '.join(sorted(_REGISTRY))))
+
+
+def _load(path):
+    module_name, _, attr = path.partition(':')
+    module = importlib.import_module(module_name)
+    return getattr(module, attr) if attr else module
+
+
+def get_core(name):
+    ''' Import and return the signal core module of a strategy (numpy only) '''
+    return _load(_spec(name).core)
+
+
+def get_engine(name, engine):
+    ''' Import and return the adapter of a strategy for the given engine, importing the framework lazily '''
+    spec = _spec(name)
+    try:
+        path = spec.engines[engine]
+    except KeyError:
+        raise KeyError('strategy %r has no %r engine, available: %s' % (name, engine, ', '.join(sorted(spec.engines))))
+    return _load(path)
+
+
+#--- built-in strategies
+register('sma', 'strategies.crossover',
+         {'zipline': 'strategies.engines.zipline_engine:SMA'})
+register('paa', 'strategies.momentum',
+         {'zipline': 'strategies.engines.zipline_engine:PAA'})
+register('ramom', 'strategies.volatility',
+         {'zipline': 'strategies.engines.zipline_engine:RAMOM'})
+register('volume_filter_1', 'strategies.channels',
+         {'backtrader': 'strategies.engines.backtrader_engine:VolumeFilter1'})
+register('volume_filter_2', 'strategies.channels',
+         {'backtrader': 'strategies.engines.backtrader_engine:VolumeFilter2'})
+register('naive', 'strategies.rebalance',
+         {'xquant': 'xQuant.naive_strat'})
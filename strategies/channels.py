@@ -0,0 +1,93 @@
+'''
+Volume filter signal core (see Volume filter/VolumeFilter1.py, VolumeFilter2.py)
+
+Price channels, up/down volume, on-balance volume and volume channels as plain arrays.
+Channel outputs follow the strategy files: rows 0,1,2,3 are the entry up, entry down,
+exit up and exit down channel.
+NumPy only.
+'''
+
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+
+def _rolling(x, lookback, reduce):
+    x = np.asarray(x, dtype=float)
+    out = np.full(x.shape, np.nan)
+    if lookback <= 0 or len(x) < lookback:
+        return out
+    out[lookback - 1:] = reduce(sliding_window_view(x, lookback, axis=0), axis=-1)
+    return out
+
+
+def rolling_max(x, lookback):
+    ''' Trailing max over lookback bars, NaN during warm-up '''
+    return _rolling(x, lookback, np.max)
+
+
+def rolling_min(x, lookback):
+    ''' Trailing min over lookback bars, NaN during warm-up '''
+    return _rolling(x, lookback, np.min)
+
+
+def price_channels(high, low, entry_lookback, exit_lookback):
+    ''' Entry/exit price channels, shape (4, T) '''
+    return np.vstack([rolling_max(high, entry_lookback), rolling_min(low, entry_lookback),
+                      rolling_max(high, exit_lookback), rolling_min(low, exit_lookback)])
+
+
+def up_down_volume(open, close, volume):
+    ''' Cumulative up volume and down volume: sum of max/min((close - open) * volume, 0) '''
+    flow = (np.asarray(close, dtype=float) - np.asarray(open, dtype=float)) * np.asarray(volume, dtype=float)
+    return np.cumsum(np.maximum(flow, 0), axis=0), np.cumsum(np.minimum(flow, 0), axis=0)
+
+
+def on_balance_volume(close, volume):
+    ''' OBV: volume added with the sign of the close-to-close change, 0 on the first bar '''
+    close = np.asarray(close, dtype=float)
+    volume = np.asarray(volume, dtype=float)
+    obv = np.zeros(close.shape)
+    obv[1:] = np.cumsum(volume[1:] * np.sign(np.diff(close, axis=0)), axis=0)
+    return obv
+
+
+def volume_channels(up, down, entry_lookback, exit_lookback):
+    ''' Entry/exit volume channels, shape (4, T). For the OBV filter pass the OBV as both up and down '''
+    return np.vstack([rolling_max(up, entry_lookback), rolling_min(down, entry_lookback),
+                      rolling_max(up, exit_lookback), rolling_min(down, exit_lookback)])
+
+
+def breakout(x, channel):
+    ''' True where x crosses above the previous bar's channel '''
+    x = np.asarray(x, dtype=float)
+    out = np.zeros(x.shape, dtype=bool)
+    with np.errstate(invalid='ignore'):
+        out[1:] = x[1:] > channel[:-1]
+    return out
+
+
+def breakdown(x, channel):
+    ''' True where x crosses below the previous bar's channel '''
+    x = np.asarray(x, dtype=float)
+    out = np.zeros(x.shape, dtype=bool)
+    with np.errstate(invalid='ignore'):
+        out[1:] = x[1:] < channel[:-1]
+    return out
+
+
+def signals(open, high, low, close, volume, entry_lookback=20, exit_lookback=10, obv=False):
+    '''
+    Long-only entry and exit signals
+    - entry: close breaks the entry up price channel and the volume filter breaks its entry up channel
+    - exit: close breaks the exit down price channel and the volume filter breaks its exit down channel
+    obv=False uses up/down volume (strategy 1), obv=True uses on-balance volume (strategy 2)
+    '''
+    pc = price_channels(high, low, entry_lookback, exit_lookback)
+    if obv:
+        up = down = on_balance_volume(close, volume)
+    else:
+        up, down = up_down_volume(open, close, volume)
+    vc = volume_channels(up, down, entry_lookback, exit_lookback)
+    entry = breakout(close, pc[0]) & breakout(up, vc[0])
+    exit = breakdown(close, pc[3]) & breakdown(down, vc[3])
+    return entry, exit
@@ -0,0 +1,179 @@
+'''
+Rolling cross-asset covariance engine (see Portfolio risk calculation/residual risk.R, PAA rel_vlt)
+
+Maintains the full N x N covariance / correlation matrix bar by bar with rank-one updates:
+- EWMA: all pairwise sums decay by lda, the new bar is added, O(N^2) per bar
+- fixed window: the new bar is added and the bar leaving the window is removed, O(N^2) per bar;
+  the sums are rebuilt from the window buffer once per window to stop floating point drift
+Assets listed at different dates (or with missing bars) are handled with pairwise validity masks:
+every pair only uses the bars where both returns exist, a pair with fewer than min_periods such
+bars, or whose last common bar is more than max_gap bars old (an asset that stopped quoting), is
+NaN in the snapshot. For EWMA max_gap defaults to the half-life of lda, since the sums of a dead
+pair never leave the average on their own.
+NumPy only.
+
+Usage:
+    engine = RollingCovariance(n_assets=12, lda=0.97)      # or window=24 * 30
+    for prices in bars:                                      # NaN before listing
+        engine.update_prices(prices)
+        snap = engine.snapshot()
+        w = risk_parity_weights(snap.cov)
+'''
+
+from collections import namedtuple
+
+import numpy as np
+
+CovarianceSnapshot = namedtuple('CovarianceSnapshot', ['bar', 'cov', 'corr', 'vol', 'count', 'valid'])
+
+
+class RollingCovariance(object):
+
+    def __init__(self, n_assets, window=None, lda=None, min_periods=2, max_gap=None):
+        if (window is None) == (lda is None):
+            raise ValueError('give exactly one of window (fixed window) or lda (EWMA)')
+        self.n_assets = n_assets
+        self.window = window
+        self.lda = lda
+        self.min_periods = min_periods
+        if max_gap is None and lda is not None:
+            max_gap = int(np.ceil(np.log(0.5) / np.log(lda)))
+        self.max_gap = max_gap
+        self.bar = 0
+        self._last_prices = np.full(n_assets, np.nan)
+        self._last_seen = np.full((n_assets, n_assets), -1)  # last bar where both i and j were valid
+        self._buffer = np.full((window, n_assets), np.nan) if window else None
+        self._reset()
+
+    def _reset(self):
+        n = self.n_assets
+        self._count = np.zeros((n, n))  # number of bars where both i and j are valid
+        self._w = np.zeros((n, n))      # sum of weights over those bars, equals _count for the fixed window
+        self._sx = np.zeros((n, n))     # sum of x_i over bars where both i and j are valid
+        self._sxx = np.zeros((n, n))    # sum of x_i^2 over the same bars
+        self._sxy = np.zeros((n, n))    # sum of x_i * x_j
+
+    def _add(self, x, sign=1.):
+        valid = ~np.isnan(x)
+        x = np.where(valid, x, 0.)
+        mask = np.outer(valid, valid).astype(float)
+        self._count += sign * mask
+        self._w += sign * mask
+        self._sx += sign * mask * x[:, None]
+        self._sxx += sign * mask * (x * x)[:, None]
+        self._sxy += sign * np.outer(x, x)  # zeros already drop invalid pairs
+
+    def update(self, returns):
+        ''' Add one bar of returns (NaN = asset not listed / no bar) '''
+        x = np.asarray(returns, dtype=float)
+        valid = ~np.isnan(x)
+        self._last_seen[np.outer(valid, valid)] = self.bar
+        if self.lda is not None:
+            self._w *= self.lda
+            self._sx *= self.lda
+            self._sxx *= self.lda
+            self._sxy *= self.lda
+            self._add(x)
+        else:
+            slot = self.bar % self.window
+            if self.bar >= self.window:
+                self._add(self._buffer[slot], -1.)
+            self._buffer[slot] = x
+            self._add(x)
+            if slot == self.window - 1:
+                self._rebuild()
+        self.bar += 1
+
+    def update_prices(self, prices):
+        ''' Add one bar of prices, log returns against the previous quote of each asset '''
+        prices = np.asarray(prices, dtype=float)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            returns = np.log(prices / self._last_prices)
+        returns[~np.isfinite(returns)] = np.nan
+        self._last_prices = np.where(np.isnan(prices), self._last_prices, prices)
+        self.update(returns)
+
+    def _rebuild(self):
+        ''' Recompute the window sums from the buffer, once per window '''
+        self._reset()
+        for x in self._buffer:
+            self._add(x)
+
+    def counts(self):
+        ''' Number of bars behind each pair '''
+        return np.rint(self._count)
+
+    def snapshot(self):
+        ''' Covariance, correlation, volatility and pairwise validity as of the last bar '''
+        count = self.counts()
+        valid = count >= self.min_periods
+        if self.max_gap is not None:
+            valid &= (self._last_seen >= 0) & (self.bar - 1 - self._last_seen <= self.max_gap)
+        w = np.where(valid, self._w, np.nan)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            mean_i = self._sx / w                    # mean of x_i over the pair's bars
+            mean_j = mean_i.T
+            cov = self._sxy / w - mean_i * mean_j
+            var_i = self._sxx / w - mean_i ** 2      # variance of x_i over the pair's bars
+            if self.lda is None:
+                # sample (n - 1) normalisation for the fixed window
+                cov = cov * count / (count - 1)
+                var_i = var_i * count / (count - 1)
+            corr = cov / np.sqrt(var_i * var_i.T)
+        np.fill_diagonal(corr, np.where(np.diag(valid), 1., np.nan))
+        vol = np.sqrt(np.diag(cov))
+        return CovarianceSnapshot(self.bar, cov, corr, vol, count, valid)
+
+
+def inverse_volatility_weights(vol):
+    ''' Weights proportional to 1 / vol over the assets with a volatility, 0 elsewhere '''
+    vol = np.asarray(vol, dtype=float)
+    inv = np.zeros(len(vol))
+    ok = np.isfinite(vol) & (vol > 0)
+    inv[ok] = 1. / vol[ok]
+    total = inv.sum()
+    return inv / total if total > 0 else inv
+
+
+def risk_parity_weights(cov, max_iter=200, tol=1e-10):
+    '''
+    Equal risk contribution weights by cyclical coordinate descent on
+    0.5 y'Cy - sum(log y), normalised to sum to one. Assets without a variance get 0,
+    pairs without enough common history are treated as uncorrelated.
+    '''
+    cov = np.asarray(cov, dtype=float)
+    weights = np.zeros(len(cov))
+    ok = np.flatnonzero(np.isfinite(np.diag(cov)) & (np.diag(cov) > 0))
+    if len(ok) == 0:
+        return weights
+    C = np.nan_to_num(cov[np.ix_(ok, ok)])
+    d = np.diag(C).copy()
+    y = 1. / np.sqrt(d)
+    for _ in range(max_iter):
+        prev = y.copy()
+        for i in range(len(y)):
+            b = C[i] @ y - d[i] * y[i]
+            y[i] = (-b + np.sqrt(b * b + 4 * d[i])) / (2 * d[i])
+        if np.max(np.abs(y - prev)) <= tol * np.max(y):
+            break
+    weights[ok] = y / y.sum()
+    return weights
+
+
+def load_closes(paths, column='Close'):
+    '''
+    Read OHLCV csv files (Data/H1 layout: Timestamp,Open,High,Low,Close,Volume) and align them
+    on the union of timestamps. Returns (timestamps, closes (T, N)) with NaN before listing / on gaps.
+    '''
+    frames = []
+    for path in paths:
+        with open(path) as f:
+            header = f.readline().strip().split(',')
+        raw = np.genfromtxt(path, delimiter=',', skip_header=1, dtype=None, encoding=None,
+                            usecols=(header.index('Timestamp'), header.index(column)))
+        frames.append((raw['f0'].astype('datetime64[m]'), raw['f1'].astype(float)))
+    timestamps = np.unique(np.concatenate([t for t, _ in frames]))
+    closes = np.full((len(timestamps), len(frames)), np.nan)
+    for j, (t, c) in enumerate(frames):
+        closes[np.searchsorted(timestamps, t), j] = c
+    return timestamps, closes
@@ -0,0 +1,39 @@
+'''
+SMA crossover signal core (see Zipline-SMA.py)
+
+Long when the short moving average is above the long one, flat/short when it is below.
+NumPy only.
+'''
+
+import numpy as np
+
+
+def moving_average(prices, window):
+    ''' Trailing simple moving average along axis 0, NaN until the window is filled '''
+    prices = np.asarray(prices, dtype=float)
+    out = np.full(prices.shape, np.nan)
+    if window <= 0 or len(prices) < window:
+        return out
+    csum = np.cumsum(prices, axis=0)
+    out[window - 1] = csum[window - 1]
+    out[window:] = csum[window:] - csum[:-window]
+    out[window - 1:] /= window
+    return out
+
+
+def crossover(prices, short=50, long=100):
+    ''' +1 where short MA > long MA, -1 where short MA < long MA, 0 otherwise (including warm-up) '''
+    ma_short = moving_average(prices, short)
+    ma_long = moving_average(prices, long)
+    signal = np.sign(ma_short - ma_long)
+    return np.nan_to_num(signal, nan=0.0)
+
+
+def latest(prices, short=50, long=100):
+    ''' Last-bar signal and the two averages, for per-bar use inside an engine '''
+    prices = np.asarray(prices, dtype=float)
+    if len(prices) < max(short, long):
+        return 0.0, np.nan, np.nan
+    ma_short = prices[-short:].mean(axis=0)
+    ma_long = prices[-long:].mean(axis=0)
+    return float(np.sign(ma_short - ma_long)), ma_short, ma_long
@@ -0,0 +1,4 @@
+'''
+Engine adapters. Each module imports its framework at load time, so only import them through
+strategies.get_engine (or directly) once an engine has been chosen.
+'''
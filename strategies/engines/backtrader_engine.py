@@ -0,0 +1,157 @@
+'''
+Backtrader adapters for the volume filter signal cores
+
+Each bar the last `entry_lookback + 1` bars are handed to strategies.channels, the signal
+math itself does not touch self.datas.
+
+Usage:
+    cerebro.addstrategy(get_engine('volume_filter_2', 'backtrader'), entry_lookback=20, exit_lookback=10)
+    cerebro.addsizer(VolatilitySizer, target_vol=0.002)    # instead of bt.sizers.FixedSize
+
+    # or size from a shared covariance engine, one column per feed in strategy.datas order
+    from strategies.covariance import RollingCovariance
+    cov = RollingCovariance(n_assets=len(feeds), lda=0.97)
+    cerebro.addanalyzer(CovarianceFeed, covariance=cov)    # pushes every feed's close each bar
+    cerebro.addsizer(VolatilitySizer, target_vol=0.002, covariance=cov)
+'''
+
+from __future__ import (absolute_import, division, print_function,
+                        unicode_literals)
+
+import numpy as np
+import backtrader as bt
+
+from strategies import channels, volatility
+
+
+class _VolumeFilter(bt.Strategy):
+    params = (
+        ('entry_lookback', 20),
+        ('exit_lookback', 10),
+    )
+    obv = False
+
+    def log(self, txt, dt=None):
+        ''' Logging function for this strategy'''
+        dt = dt or self.datas[0].datetime.date(0)
+        print('%s, %s' % (dt.isoformat(), txt))
+
+    def __init__(self):
+        self.order = None
+        self.window = max(self.p.entry_lookback, self.p.exit_lookback) + 1
+
+    def _bars(self, line):
+        return np.asarray(line.get(size=self.window), dtype=float)
+
+    def signals(self):
+        ''' Entry and exit signal on the current bar '''
+        d = self.datas[0]
+        # OBV / up-down volume are cumulative; within the window only differences matter for the channels
+        entry, exit = channels.signals(self._bars(d.open), self._bars(d.high), self._bars(d.low),
+                                       self._bars(d.close), self._bars(d.volume),
+                                       self.p.entry_lookback, self.p.exit_lookback, obv=self.obv)
+        return bool(entry[-1]), bool(exit[-1])
+
+    def notify_order(self, order):
+        if order.status in [order.Submitted, order.Accepted]:
+            return
+
+        if order.status in [order.Completed]:
+            if order.isbuy():
+                self.log('BUY EXECUTED, Price: %.2f, Cost: %.2f, Comm %.2f' %
+                         (order.executed.price, order.executed.value, order.executed.comm))
+            else:
+                self.log('SELL EXECUTED, Price: %.2f, Cost: %.2f, Comm %.2f' %
+                         (order.executed.price, order.executed.value, order.executed.comm))
+
+        elif order.status in [order.Canceled, order.Margin, order.Rejected]:
+            self.log('Order Canceled/Margin/Rejected')
+
+        self.order = None
+
+    def notify_trade(self, trade):
+        if not trade.isclosed:
+            return
+
+        self.log('OPERATION PROFIT, GROSS %.2f, NET %.2f' % (trade.pnl, trade.pnlcomm))
+
+    def next(self):
+        if self.order or len(self) < self.window:
+            return
+
+        buy_sig, sell_sig = self.signals()
+        if not self.position:
+            if buy_sig:
+                self.log('BUY CREATE, %.2f' % self.datas[0].close[0])
+                self.order = self.buy()
+        elif sell_sig:
+            self.log('SELL CREATE, %.2f' % self.datas[0].close[0])
+            self.order = self.sell()
+
+
+class VolumeFilter1(_VolumeFilter):
+    ''' Volume filter strategy 1: price breakouts confirmed by up/down volume '''
+    obv = False
+
+
+class VolumeFilter2(_VolumeFilter):
+    ''' Volume filter strategy 2: price breakouts confirmed by OBV '''
+    obv = True
+
+
+class CovarianceFeed(bt.Analyzer):
+    '''
+    Push the close of every feed in strategy.datas order to a RollingCovariance. A feed without a
+    bar at the strategy's current datetime (not started, finished or skipped) is passed as NaN
+    instead of its repeated last close, which would count as a 0 return.
+    '''
+    params = (
+        ('covariance', None),
+    )
+
+    def prenext(self):
+        self.next()
+
+    def next(self):
+        now = self.strategy.datetime[0]
+        self.p.covariance.update_prices([d.close[0] if len(d) and d.datetime[0] == now else np.nan
+                                         for d in self.strategy.datas])
+
+    def get_analysis(self):
+        return self.p.covariance.snapshot()
+
+
+class VolatilitySizer(bt.Sizer):
+    '''
+    Volatility-adjusted alternative to FixedSize: size so that one bar of the position moves the
+    portfolio by about target_vol. The volatility comes from a shared RollingCovariance engine
+    (strategies.covariance) when one is given, else from an EWMA over the last lookback closes.
+    A shared engine must be fed by CovarianceFeed (or the caller) with its columns in
+    strategy.datas order; orders are sized from the previous bar's snapshot.
+    '''
+    params = (
+        ('target_vol', 0.002),
+        ('lda', 0.94),
+        ('lookback', 100),
+        ('covariance', None),
+    )
+
+    def _volatility(self, data):
+        if self.p.covariance is not None:
+            # by identity: line objects overload ==, datas.index() would compare close values
+            column = next(i for i, d in enumerate(self.strategy.datas) if d is data)
+            return self.p.covariance.snapshot().vol[column]
+        closes = np.asarray(data.close.get(size=min(len(data), self.p.lookback)), dtype=float)
+        if len(closes) < 3:
+            return np.nan
+        return volatility.ewma_volatility(volatility.log_returns(closes), self.p.lda)[-1]
+
+    def _getsizing(self, comminfo, cash, data, isbuy):
+        if not isbuy:
+            return self.broker.getposition(data).size or 0
+        vol = self._volatility(data)
+        price = data.close[0]
+        if not np.isfinite(vol) or vol <= 0 or price <= 0:
+            return 0
+        value = self.broker.getvalue()
+        return min(value * self.p.target_vol / (vol * price), cash / price)
@@ -0,0 +1,111 @@
+'''
+Zipline adapters for the SMA, PAA and RAMOM signal cores
+
+Usage:
+    algo = get_engine('sma', 'zipline')(security='AAPL')
+    run_algorithm(initialize=algo.initialize, handle_data=algo.handle_data, ...)
+'''
+
+import logging
+
+import numpy as np
+from zipline.api import order, order_target, order_target_percent, record, symbol, symbols, get_open_orders
+
+from strategies import crossover, momentum, volatility
+
+logger = logging.getLogger(__name__)
+
+
+class SMA(object):
+    ''' Buy with all cash when the short MA crosses above the long MA, close when it crosses below '''
+
+    def __init__(self, security='AAPL', short=50, long=100):
+        self.security = security
+        self.short = short
+        self.long = long
+
+    def initialize(self, context):
+        context.security = symbol(self.security)
+
+    def handle_data(self, context, data):
+        prices = data.history(context.security, 'price', self.long, '1d').values
+        signal, MA1, MA2 = crossover.latest(prices, self.short, self.long)
+
+        current_price = data.current(context.security, 'price')
+        current_positions = context.portfolio.positions[context.security].amount
+        cash = context.portfolio.cash
+
+        if signal > 0 and current_positions == 0:
+            number_of_shares = int(cash / current_price)
+            order(context.security, number_of_shares)
+            logger.info('Buying shares')
+        elif signal < 0 and current_positions != 0:
+            order_target(context.security, 0)
+            logger.info('Selling shares')
+
+        record(MA1=MA1, MA2=MA2, Price=current_price)
+
+
+class PAA(object):
+    ''' Protective asset allocation, rebalanced every `period` bars '''
+
+    def __init__(self, proxies, equities, safe, lookback=4, protection=2, top_m=6, period=21):
+        self.proxies = proxies
+        self.equities = equities
+        self.safe = safe
+        self.lookback = lookback
+        self.protection = protection
+        self.top_m = top_m
+        self.period = period
+
+    def initialize(self, context):
+        context.proxies = symbols(*self.proxies)
+        context.equities = symbols(*self.equities)
+        context.safe = symbols(*self.safe)
+        context.bars = 0
+
+    def handle_data(self, context, data):
+        context.bars += 1
+        if (context.bars - 1) % self.period:
+            return
+        n = self.lookback * self.period
+        proxy_prices = data.history(context.proxies, 'price', n, '1d').values
+        equity_prices = data.history(context.equities, 'price', n, '1d').values
+        w_eq, w_safe, bf = momentum.paa_weights(proxy_prices, equity_prices, len(context.safe),
+                                                self.lookback, self.protection, self.top_m, self.period)
+
+        # an asset listed in both the equity and the safe set gets the sum of its weights
+        targets = {}
+        for asset, w in zip(list(context.equities) + list(context.safe), np.concatenate([w_eq, w_safe])):
+            targets[asset] = targets.get(asset, 0.) + w
+        for asset, w in targets.items():
+            if get_open_orders(asset):
+                continue
+            if data.can_trade(asset):
+                order_target_percent(asset, w)
+
+        record(leverage=context.account.leverage, b_frac=bf)
+
+
+class RAMOM(object):
+    ''' Single-instrument risk-adjusted momentum, volatility-scaled position '''
+
+    def __init__(self, security='SPY', k1=12, k2=1, lda=0.94, period=volatility.PERIOD, target_vol=0.01):
+        self.security = security
+        self.k1 = k1
+        self.k2 = k2
+        self.lda = lda
+        self.period = period
+        self.target_vol = target_vol
+
+    def initialize(self, context):
+        context.security = symbol(self.security)
+
+    def handle_data(self, context, data):
+        n = self.period * (self.k1 + self.k2) + 2
+        prices = data.history(context.security, 'price', n, '1d').values
+        position = volatility.ramom_position(prices, self.k1, self.k2, self.lda, self.period) / self.k2
+        weight = float(volatility.scaled_position(prices, position, self.lda)) * self.target_vol
+        if data.can_trade(context.security) and not get_open_orders(context.security):
+            order_target_percent(context.security, weight)
+        record(position=position, weight=weight)
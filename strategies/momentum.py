@@ -0,0 +1,48 @@
+'''
+Protective asset allocation signal core (see Protective asset allocation/PAA.py)
+
+1. MOM of each asset = price / SMA(lookback months) - 1
+2. n = number of proxy assets with positive MOM
+3. bond fraction BF = (N - n) / (N - n1), n1 = protection * N / 4, capped to [0, 1]
+4. (1 - BF) goes equally into the top min(n, topM) equities sorted on MOM, BF into the safe set
+NumPy only. Prices are (T, N) arrays, one column per asset.
+'''
+
+import numpy as np
+
+
+def momentum(prices, lookback=4, period=21):
+    ''' MOM = last price / SMA over the last lookback * period bars - 1, one value per column '''
+    window = np.asarray(prices, dtype=float)[-lookback * period:]
+    return window[-1] / window.mean(axis=0) - 1
+
+
+def bond_fraction(mom, protection=2):
+    ''' Fraction of the portfolio in the safe set given the proxies' MOM '''
+    mom = np.asarray(mom, dtype=float)
+    N = len(mom)
+    n = int(np.sum(mom > 0))
+    n1 = protection * N / 4.
+    if n <= n1:
+        return 1.0
+    return min(max((N - n) / (N - n1), 0.0), 1.0)
+
+
+def top_weights(mom, top_m, fraction):
+    ''' Split fraction equally over the top min(n_positive, top_m) assets by MOM, zeros elsewhere '''
+    mom = np.asarray(mom, dtype=float)
+    weights = np.zeros(len(mom))
+    n_eq = min(int(np.sum(mom > 0)), top_m)
+    if n_eq == 0 or fraction <= 0:
+        return weights
+    top = np.argsort(-mom, kind='stable')[:n_eq]
+    weights[top] = fraction / n_eq
+    return weights
+
+
+def paa_weights(proxy_prices, equity_prices, n_safe, lookback=4, protection=2, top_m=6, period=21):
+    ''' Target weights for the equity set and the safe set, and the bond fraction '''
+    bf = bond_fraction(momentum(proxy_prices, lookback, period), protection)
+    w_eq = top_weights(momentum(equity_prices, lookback, period), top_m, 1 - bf)
+    w_safe = np.full(n_safe, bf / n_safe) if n_safe else np.zeros(0)
+    return w_eq, w_safe, bf
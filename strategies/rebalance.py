@@ -0,0 +1,227 @@
+'''
+Vectorized rebalance engine for large universes (see xQuant/naive_strat.py)
+
+Weights live in arrays aligned to a universe index (asset -> slot) instead of being rebuilt as
+dicts every bar:
+- an unchanged universe costs one list comparison, only added/removed assets touch the index;
+  callers that already know the diff pass it to apply_diff
+- prices come in as an array in the feed's own layout and are mapped to the slots with np.take,
+  the slot -> column array is only rebuilt when the index changes
+- target-vs-current deltas are computed on the arrays
+- bars where every |target - current| stays within the tolerance band are skipped
+- a trading bar returns one batch: the complete {asset: target weight} map of the active universe,
+  after which the book is taken to be at target (current = target for every slot)
+- slots freed by removed assets are reused lowest first, and the index is compacted once more
+  than half of it is free, so the arrays follow the live universe size
+NumPy only.
+
+Usage:
+    engine = RebalanceEngine(tolerance=0.01)
+    engine.update_universe(universe)       # or engine.apply_diff(added, removed)
+    engine.drift(engine.take(prices, columns))   # columns: asset -> position in the prices array
+    engine.equal_weight()
+    batch = engine.orders()                # empty dict when nothing needs to trade
+'''
+
+import heapq
+
+import numpy as np
+
+
+class RebalanceEngine(object):
+
+    def __init__(self, tolerance=0.0, capacity=64):
+        self.tolerance = tolerance  # skip the bar when no weight drifted more than this
+        self._assets = []           # slot -> asset (None for a free slot)
+        self._slot = {}             # asset -> slot
+        self._free = []             # heap of released slots, reused lowest first before growing
+        self._members = set()
+        self._membership_changed = False
+        self._last_universe = None  # copy of the last list passed to update_universe
+        self._version = 0           # bumped whenever slots are assigned, freed or moved
+        self._columns = None        # (columns mapping, version) the cached _cols was built for
+        self._cols = np.zeros(0, dtype=np.intp)
+        self.active = np.zeros(capacity, dtype=bool)
+        self.current = np.zeros(capacity)
+        self.target = np.zeros(capacity)
+        self._last_prices = np.full(capacity, np.nan)
+
+    def __len__(self):
+        return len(self._members)
+
+    @property
+    def size(self):
+        ''' Number of slots in use, the arrays are meaningful up to this index '''
+        return len(self._assets)
+
+    @property
+    def assets(self):
+        ''' Assets in slot order, None for free slots '''
+        return list(self._assets)
+
+    def index(self, assets):
+        ''' Slots of the given assets '''
+        return np.fromiter((self._slot[a] for a in assets), dtype=np.intp)
+
+    def take(self, prices, columns):
+        '''
+        Prices aligned to the slots from an array in the feed's layout, columns maps
+        asset -> position in it. NaN for free slots and assets the feed does not carry.
+        '''
+        if self._columns is None or self._columns[0] is not columns or self._columns[1] != self._version:
+            self._cols = np.array([-1 if a is None else columns.get(a, -1) for a in self._assets], dtype=np.intp)
+            self._columns = (columns, self._version)
+        out = np.take(np.asarray(prices, dtype=float), self._cols, mode='clip')
+        out[self._cols < 0] = np.nan
+        return out
+
+    #--- universe
+    def _grow(self):
+        capacity = max(2 * len(self.active), 1)
+        for name in ('active', 'current', 'target'):
+            old = getattr(self, name)
+            new = np.zeros(capacity, dtype=old.dtype)
+            new[:len(old)] = old
+            setattr(self, name, new)
+        prices = np.full(capacity, np.nan)
+        prices[:len(self._last_prices)] = self._last_prices
+        self._last_prices = prices
+
+    def _add(self, asset):
+        slot = self._slot.get(asset)
+        if slot is None:
+            if self._free:
+                slot = heapq.heappop(self._free)
+                self._assets[slot] = asset
+            else:
+                slot = len(self._assets)
+                if slot == len(self.active):
+                    self._grow()
+                self._assets.append(asset)
+            self._slot[asset] = slot
+            self._version += 1
+        # an asset removed and re-added before its exit order went out keeps its slot and holding
+        self.active[slot] = True
+
+    def _remove(self, asset):
+        slot = self._slot[asset]
+        self.active[slot] = False
+        self.target[slot] = 0.
+
+    def apply_diff(self, added=(), removed=()):
+        ''' Incremental membership update when the caller already knows the diff '''
+        self._last_universe = None
+        for asset in removed:
+            if asset in self._members:
+                self._members.discard(asset)
+                self._remove(asset)
+                self._membership_changed = True
+        for asset in added:
+            if asset not in self._members:
+                self._members.add(asset)
+                self._add(asset)
+                self._membership_changed = True
+
+    def update_universe(self, universe):
+        ''' Diff the new universe against the current one, returns (added, removed) '''
+        if isinstance(universe, (set, frozenset)):
+            if universe == self._members:
+                return [], set()
+            new = universe
+        else:
+            if not isinstance(universe, list):
+                universe = list(universe)
+            if universe == self._last_universe:
+                return [], set()
+            new = set(universe)
+        added = new - self._members
+        removed = self._members - new
+        if added and new is not universe:
+            # keep the caller's order for new slots so the index is deterministic
+            added = [a for a in universe if a in added]
+        if added or removed:
+            self.apply_diff(added, removed)
+        if new is not universe:
+            self._last_universe = list(universe)
+        return added, removed
+
+    #--- weights
+    def equal_weight(self):
+        ''' Target 1/N over the active universe '''
+        n = self.size
+        self.target[:n] = 0.
+        if self._members:
+            self.target[:n][self.active[:n]] = 1. / len(self._members)
+
+    def targets(self):
+        ''' Complete {asset: target weight} of the active universe '''
+        return {self._assets[i]: float(self.target[i]) for i in np.flatnonzero(self.active[:self.size])}
+
+    def set_target(self, weights):
+        ''' Target weights aligned to the slots (length self.size), inactive slots are forced to 0 '''
+        n = self.size
+        self.target[:n] = np.where(self.active[:n], weights, 0.)
+        self.target[n:] = 0.
+
+    def drift(self, prices):
+        ''' Let current weights drift with prices aligned to the slots (NaN = no quote, weight kept) '''
+        n = self.size
+        prices = np.asarray(prices, dtype=float)
+        last = self._last_prices[:n]
+        with np.errstate(divide='ignore', invalid='ignore'):
+            growth = prices / last
+        growth[~np.isfinite(growth)] = 1.
+        value = self.current[:n] * growth
+        total = value.sum()
+        if total > 0:
+            self.current[:n] = value * (self.current[:n].sum() / total)
+        self._last_prices[:n] = np.where(np.isnan(prices), last, prices)
+
+    #--- orders
+    def orders(self):
+        '''
+        The bar's batch: the complete {asset: target weight} map of the active universe (assets
+        left out are closed), or an empty dict when no weight drifted past the tolerance band
+        '''
+        n = self.size
+        if not self._membership_changed and (n == 0 or np.abs(self.target[:n] - self.current[:n]).max() <= self.tolerance):
+            return {}
+        batch = self.targets()
+        self.current[:n] = self.target[:n]
+        self._membership_changed = False
+        self._release()
+        return batch
+
+    def _release(self):
+        ''' Free the slots of removed assets that no longer hold anything '''
+        n = self.size
+        done = np.flatnonzero(~self.active[:n] & (self.current[:n] == 0))
+        for slot in done:
+            asset = self._assets[slot]
+            if asset is None:
+                continue
+            del self._slot[asset]
+            self._assets[slot] = None
+            self._free.append(int(slot))
+            self._last_prices[slot] = np.nan
+            self._version += 1
+        if len(self._free) > self.size // 2:
+            self._compact()
+        else:
+            while self._assets and self._assets[-1] is None:
+                self._assets.pop()
+            self._free = [slot for slot in self._free if slot < self.size]
+            heapq.heapify(self._free)
+
+    def _compact(self):
+        ''' Move the live slots to the front, in slot order, and drop the free ones '''
+        live = np.array([i for i, a in enumerate(self._assets) if a is not None], dtype=np.intp)
+        n = len(live)
+        for name in ('active', 'current', 'target', '_last_prices'):
+            arr = getattr(self, name)
+            arr[:n] = arr[live]
+            arr[n:] = np.nan if name == '_last_prices' else 0
+        self._assets = [self._assets[i] for i in live]
+        self._slot = {asset: slot for slot, asset in enumerate(self._assets)}
+        self._free = []
+        self._version += 1
@@ -0,0 +1,85 @@
+import numpy as np
+
+from strategies.covariance import RollingCovariance, risk_parity_weights
+
+
+def _returns(T=300, N=4, seed=1):
+    rng = np.random.default_rng(seed)
+    mix = np.array([[1, .5, 0, 0], [0, 1, .3, 0], [0, 0, 1, .2], [0, 0, 0, 1.]])
+    X = rng.normal(0, 1, (T, N)) @ mix
+    X[:120, 2] = np.nan                    # listed late
+    X[rng.random((T, N)) < .05] = np.nan   # missing bars
+    return X
+
+
+def _pair(X, i, j):
+    both = ~np.isnan(X[:, i]) & ~np.isnan(X[:, j])
+    return X[both, i], X[both, j], both
+
+
+def test_fixed_window_matches_np_cov_on_masked_pairs():
+    X, window = _returns(), 50
+    engine = RollingCovariance(X.shape[1], window=window)
+    for x in X:
+        engine.update(x)
+    snap = engine.snapshot()
+    for i in range(X.shape[1]):
+        for j in range(X.shape[1]):
+            a, b, _ = _pair(X[-window:], i, j)
+            assert np.isclose(snap.cov[i, j], np.cov(a, b)[0, 1])
+            assert np.isclose(snap.corr[i, j], np.corrcoef(a, b)[0, 1])
+
+
+def test_ewma_matches_weighted_cov_on_masked_pairs():
+    X, lda = _returns(), 0.97
+    engine = RollingCovariance(X.shape[1], lda=lda)
+    for x in X:
+        engine.update(x)
+    snap = engine.snapshot()
+    decay = lda ** np.arange(len(X))[::-1]
+    for i in range(X.shape[1]):
+        for j in range(X.shape[1]):
+            a, b, both = _pair(X, i, j)
+            assert np.isclose(snap.cov[i, j], np.cov(a, b, aweights=decay[both], bias=True)[0, 1])
+
+
+def test_pairs_below_min_periods_are_nan():
+    engine = RollingCovariance(2, window=10, min_periods=5)
+    for t in range(10):
+        engine.update([0.01 * t, np.nan if t < 7 else 0.02 * t])
+    snap = engine.snapshot()
+    assert not snap.valid[0, 1] and np.isnan(snap.cov[0, 1])
+    assert snap.valid[0, 0] and np.isfinite(snap.vol[0])
+
+
+def test_risk_parity_equal_contributions():
+    X = _returns()
+    engine = RollingCovariance(X.shape[1], lda=0.97)
+    for x in X:
+        engine.update(x)
+    cov = engine.snapshot().cov
+    w = risk_parity_weights(cov)
+    contributions = w * (cov @ w)
+    assert np.isclose(w.sum(), 1.)
+    assert np.allclose(contributions, contributions.mean())
+
+
+def test_ewma_masks_assets_that_stopped_quoting():
+    rng = np.random.default_rng(2)
+    engine = RollingCovariance(2, lda=0.97)
+    for _ in range(100):
+        engine.update(rng.normal(0, 0.01, 2))
+    for _ in range(5000):
+        engine.update([rng.normal(0, 0.01), np.nan])
+    snap = engine.snapshot()
+    assert snap.valid[0, 0] and np.isfinite(snap.vol[0])
+    assert not snap.valid[1].any() and not snap.valid[:, 1].any()
+    assert np.isnan(snap.vol[1]) and np.isnan(snap.cov[0, 1])
+
+
+def test_ewma_keeps_pairs_through_short_gaps():
+    rng = np.random.default_rng(3)
+    engine = RollingCovariance(2, lda=0.97)
+    for t in range(100):
+        engine.update([rng.normal(0, 0.01), np.nan if 90 <= t < 95 else rng.normal(0, 0.01)])
+    assert engine.snapshot().valid.all()
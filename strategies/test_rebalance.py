@@ -0,0 +1,59 @@
+import numpy as np
+
+from strategies.rebalance import RebalanceEngine
+
+
+def _engine(universe, tolerance=0.05):
+    columns = {a: i for i, a in enumerate(universe)}
+    engine = RebalanceEngine(tolerance=tolerance)
+    engine.update_universe(universe)
+    engine.drift(engine.take(np.ones(len(universe)), columns))
+    engine.equal_weight()
+    engine.orders()
+    return engine, columns
+
+
+def test_bar_inside_band_is_skipped():
+    engine, columns = _engine(['A', 'B', 'C', 'D'])
+    engine.update_universe(['A', 'B', 'C', 'D'])
+    engine.drift(engine.take([1.05, 1., 1., 1.], columns))
+    engine.equal_weight()
+    assert engine.orders() == {}
+
+
+def test_bar_past_band_trades_full_map():
+    engine, columns = _engine(['A', 'B', 'C', 'D'])
+    engine.drift(engine.take([2., 1., 1., 1.], columns))
+    engine.equal_weight()
+    assert engine.orders() == {'A': 0.25, 'B': 0.25, 'C': 0.25, 'D': 0.25}
+    # the book is at target after the batch
+    assert np.allclose(engine.current[:engine.size], engine.target[:engine.size])
+
+
+def test_swapped_asset_batch():
+    engine, _ = _engine(['A', 'B', 'C', 'D'])
+    engine.update_universe(['A', 'B', 'C', 'E'])
+    engine.equal_weight()
+    assert engine.orders() == {'A': 0.25, 'B': 0.25, 'C': 0.25, 'E': 0.25}
+    assert [a for a in engine.assets if a is not None] == ['A', 'B', 'C', 'E']
+
+
+def test_apply_diff_and_take_follow_slots():
+    engine, _ = _engine(['A', 'B'])
+    engine.apply_diff(added=['C'], removed=['A'])
+    engine.equal_weight()
+    engine.orders()
+    feed = {'C': 0, 'B': 2}
+    prices = engine.take([3., 9., 2.], feed)
+    assert np.allclose(prices[engine.index(['B', 'C'])], [2., 3.])
+    assert np.isnan(prices[[i for i, a in enumerate(engine.assets) if a is None]]).all()
+
+
+def test_freed_slots_are_compacted():
+    engine, _ = _engine(list(range(100)))
+    engine.update_universe([])
+    engine.equal_weight()
+    engine.orders()
+    engine.update_universe(['x', 'y'])
+    assert engine.size == 2
+    assert engine.assets == ['x', 'y']
@@ -0,0 +1,62 @@
+import numpy as np
+
+from strategies import channels, crossover, momentum, volatility
+
+
+def _brute(x, window, reduce):
+    return np.array([reduce(x[t - window + 1:t + 1]) if t >= window - 1 else np.nan for t in range(len(x))])
+
+
+def test_moving_average_and_rolling_max_match_brute_force():
+    x = np.random.default_rng(0).normal(size=40).cumsum()
+    for window in (1, 3, 7):
+        assert np.allclose(crossover.moving_average(x, window), _brute(x, window, np.mean), equal_nan=True)
+        assert np.allclose(channels.rolling_max(x, window), _brute(x, window, np.max), equal_nan=True)
+        assert np.allclose(channels.rolling_min(x, window), _brute(x, window, np.min), equal_nan=True)
+    assert np.isnan(crossover.moving_average(x[:2], 3)).all()
+
+
+def test_ewma_volatility_first_values():
+    # (3.2) with lda = 0.5: sigma_2^2 = r_1^2, sigma_3^2 = 0.5 * r_1^2 + 0.5 * r_2^2
+    vol = volatility.ewma_volatility([np.nan, 0.1, 0.2, -0.1], lda=0.5)
+    assert np.isnan(vol[:2]).all()
+    assert np.allclose(vol[2:], [0.1, np.sqrt(0.025)])
+
+
+def test_bond_fraction_edges():
+    assert momentum.bond_fraction([1, 1, 1, 1], protection=2) == 0.
+    assert momentum.bond_fraction([1, 1, -1, -1], protection=2) == 1.   # n <= n1 = 2
+    assert momentum.bond_fraction([1, 1, 1, -1], protection=2) == 0.5   # (4 - 3) / (4 - 2)
+    assert momentum.bond_fraction([-1, -1, -1, -1], protection=0) == 1.
+    assert momentum.bond_fraction([1, 1, -1, -1], protection=0) == 0.5  # (4 - 2) / 4
+
+
+def test_top_weights_ties():
+    mom = [0.1, 0.2, 0.2, -0.1]
+    assert np.allclose(momentum.top_weights(mom, 2, 1.), [0, 0.5, 0.5, 0])
+    # ties keep the earlier asset
+    assert np.allclose(momentum.top_weights(mom, 1, 0.6), [0, 0.6, 0, 0])
+    # never more names than positive MOM
+    assert np.allclose(momentum.top_weights(mom, 6, 0.9), [0.3, 0.3, 0.3, 0])
+    assert not momentum.top_weights([-1, -2], 2, 1.).any()
+
+
+def test_signals_up_down_volume_and_obv():
+    close = [10, 11, 12, 11, 10]
+    open = [10, 12, 12, 12, 11]
+    # bar 2 breaks the price channel but has no up volume, OBV still rises with the close
+    entry, exit = channels.signals(open, close, close, close, [1] * 5, 2, 2, obv=False)
+    assert entry.tolist() == [False] * 5
+    assert exit.tolist() == [False, False, False, False, True]
+    entry, exit = channels.signals(open, close, close, close, [1] * 5, 2, 2, obv=True)
+    assert entry.tolist() == [False, False, True, False, False]
+    assert exit.tolist() == [False, False, False, False, True]
+    assert channels.on_balance_volume(close, [1] * 5).tolist() == [0, 1, 2, 1, 0]
+
+
+def test_ramom_and_tsmom_sign_sums():
+    prices = np.exp(np.linspace(0, 1, 60))  # steady uptrend
+    assert volatility.tsmom_position(prices, k1=1, k2=2, period=10) == 2.
+    assert volatility.tsmom_position(prices[::-1], k1=1, k2=2, period=10) == -2.
+    zigzag = prices * (1 + 0.01 * (-1) ** np.arange(60))
+    assert volatility.ramom_position(zigzag, k1=1, k2=3, period=10) == 3.
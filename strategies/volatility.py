@@ -0,0 +1,88 @@
+'''
+Risk-adjusted momentum signal core (see Risk-adjusted momentum/RAMON.py)
+
+- log returns over h periods
+- EWMA volatility, (3.2): sigma_t^2 = lda * sigma_{t-1}^2 + (1 - lda) * r_{t-1}^2
+- risk-adjusted returns, (3.3): rolling sum of r_t / sigma_t
+- TSMOM (3.4) and RAMOM (3.5) positions: sum over k2 sub-periods of the sign of the signal
+NumPy only. Prices and returns are (T,) or (T, N) arrays.
+'''
+
+import numpy as np
+
+PERIOD = 25                # equivalent to a business month
+LAMBDAS = [0.94, 0.87, 0.5]  # standard lambda values correspond to 30-day, 15-day, 5-day realized volatility
+
+
+def log_returns(prices, h=1):
+    ''' log(p_t / p_{t-h}), NaN for the first h bars '''
+    prices = np.asarray(prices, dtype=float)
+    out = np.full(prices.shape, np.nan)
+    out[h:] = np.log(prices[h:] / prices[:-h])
+    return out
+
+
+def ewma_volatility(returns, lda=0.94):
+    ''' EWMA volatility from (3.2), seeded with the first squared return, NaN until it is defined '''
+    returns = np.asarray(returns, dtype=float)
+    var = np.full(returns.shape, np.nan)
+    prev = np.full(returns.shape[1:], np.nan)
+    for t in range(1, len(returns)):
+        r2 = returns[t - 1] ** 2
+        prev = np.where(np.isnan(prev), r2, lda * prev + (1 - lda) * r2)
+        var[t] = prev
+    return np.sqrt(var)
+
+
+def _rolling_sum(x, window):
+    ''' Trailing sum, NaN for any window that contains a NaN '''
+    out = np.full(x.shape, np.nan)
+    if window <= 0 or len(x) < window:
+        return out
+    missing = np.isnan(x)
+    csum = np.cumsum(np.where(missing, 0., x), axis=0)
+    cnan = np.cumsum(missing, axis=0)
+    out[window - 1] = csum[window - 1]
+    out[window:] = csum[window:] - csum[:-window]
+    nans = cnan[window - 1:].copy()
+    nans[1:] -= cnan[:-window]
+    out[window - 1:][nans > 0] = np.nan
+    return out
+
+
+def risk_adjusted_returns(returns, h, lda=0.94):
+    ''' (3.3): sum of r_t / sigma_t over the last h bars '''
+    returns = np.asarray(returns, dtype=float)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        scaled = returns / ewma_volatility(returns, lda)
+    return _rolling_sum(scaled, h)
+
+
+def _sign_sum(signal, k2, period):
+    ''' sum over c < k2 of sign(signal lagged c periods), taken at the last bar '''
+    position = 0.
+    for c in range(k2):
+        idx = len(signal) - 1 - period * c
+        if idx < 0 or np.all(np.isnan(signal[idx])):
+            break
+        position = position + np.sign(np.nan_to_num(signal[idx]))
+    return position
+
+
+def tsmom_position(prices, k1, k2, period=PERIOD):
+    ''' (3.4): position from the signs of k1-month returns over the last k2 months '''
+    returns = log_returns(prices)
+    return _sign_sum(_rolling_sum(returns, period * k1), k2, period)
+
+
+def ramom_position(prices, k1, k2, lda=0.94, period=PERIOD):
+    ''' (3.5): position from the signs of k1-month risk-adjusted returns over the last k2 months '''
+    returns = log_returns(prices)
+    return _sign_sum(risk_adjusted_returns(returns, period * k1, lda), k2, period)
+
+
+def scaled_position(prices, position, lda=0.94):
+    ''' Position scaled by the inverse of the current EWMA volatility, as in (3.4) and (3.5) '''
+    sigma = ewma_volatility(log_returns(prices), lda)[-1]
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return np.nan_to_num(position / sigma)
@@ -1,12 +1,33 @@
 from xquant.api import get_universe, rebalance_portfolio
 
+from strategies.rebalance import RebalanceEngine
+
 def initialize(context):
-	pass
+	# equal weights kept as arrays aligned to the universe, bars within the band are skipped
+	context.engine = RebalanceEngine(tolerance=0.01)
+
+def price_source(context, data):
+	'''
+	Adapter hook for this bar's prices: return (prices, columns), prices a 1-d array in the feed's
+	layout and columns a dict asset -> position in it (keep the same dict while the layout holds,
+	the engine caches the mapping on it).
+	xquant's price API is not part of this repo, so by default there is no source: the drift check
+	is skipped and the portfolio is only rebalanced when the universe changes.
+	'''
+	return None
 
 def handle_data(context, data):
-	# get the universe
+	engine = context.engine
+	# get the universe, only added/removed assets touch the engine
 	universe = get_universe(data, context.datetime)
+	engine.update_universe(universe)
+	# let the held weights drift with this bar's prices
+	source = price_source(context, data)
+	if source is not None:
+		engine.drift(engine.take(*source))
 	# compute weights
-	weights = {asset: 1. / len(universe) for asset in universe}
-	# rebalance portfolio
-	rebalance_portfolio(context, data, weights)
\ No newline at end of file
+	engine.equal_weight()
+	# rebalance portfolio once any weight drifted past the band, with the full target map
+	orders = engine.orders()
+	if orders:
+		rebalance_portfolio(context, data, orders)